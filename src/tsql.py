@@ -1,15 +1,20 @@
-import json
+import os
 import sqlite3
+import threading
 import time
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
 
 from rich.text import Text
+from textual import work
 from textual.app import App, ComposeResult
 from textual.binding import Binding
 from textual.containers import ScrollableContainer, Vertical
 from textual.screen import Screen
 from textual.widget import Widget
 from textual.widgets import DataTable, Footer, Header, Static
+from textual.worker import Worker, get_current_worker
 
 from src.widget.textarea import TextArea
 
@@ -17,16 +22,58 @@ PATH = r"database3.db"
 
 
 class SQLDB:
+    PRAGMAS = (
+        "journal_mode=WAL",
+        "synchronous=NORMAL",
+        "temp_store=MEMORY",
+        "cache_size=-64000",
+        "mmap_size=268435456",
+    )
+    FETCH_SIZE = 1000
+
     def __init__(self, database) -> None:
         self.database = database
-        self.conn = sqlite3.connect(self.database)
-        self.conn.row_factory = sqlite3.Row
-
+        self.conn = sqlite3.connect(
+            self.database,
+            isolation_level=None,
+            check_same_thread=False,
+            cached_statements=1024,
+        )
+        for pragma in self.PRAGMAS:
+            self.conn.execute(f"PRAGMA {pragma}")
+        self._lock = threading.Lock()
+
+    @contextmanager
     def execute_sql(self, sql):
-        with self.conn as conn:
-            cur = conn.cursor()
-            res = cur.execute(sql)
-            return json.dumps([dict(x) for x in res.fetchall()])
+        """Execute sql, yielding its description and an iterator of row chunks
+
+        The connection is held until the block exits, so one query is
+        never fetched while another runs on it.
+        """
+        with self._lock:
+            cur = self.conn.cursor()
+            cur.arraysize = self.FETCH_SIZE
+            try:
+                cur.execute(sql)
+                yield cur.description, iter(cur.fetchmany, [])
+            finally:
+                cur.close()
+
+    def interrupt(self) -> None:
+        """Abort the query currently running, from any thread"""
+        self.conn.interrupt()
+
+
+def get_database(database) -> SQLDB:
+    """Return the shared SQLDB for a database, connecting on first use"""
+    if database != ":memory:":
+        database = os.path.abspath(database)
+    return _get_database(database)
+
+
+@lru_cache(maxsize=None)
+def _get_database(database: str) -> SQLDB:
+    return SQLDB(database)
 
 
 class ResultInfoBar(Widget):
@@ -75,37 +122,61 @@ class EditorScreen(Screen):
         yield Footer()
 
     def on_mount(self) -> None:
+        table = self.query_one(DataTable)
+        table.zebra_stripes = True
+        table.cursor_type = "row"
         self.query_one("#sql-editor").focus()
-        self._db = SQLDB(PATH)
+        self._db = get_database(PATH)
+        self._query: Worker | None = None
 
     def action_execute_sql(self) -> None:
-        query = self.query_one("#sql-editor").value
+        if self._query is not None and self._query.is_running:
+            self._query.cancel()
+            self._db.interrupt()
+        self._query = self._execute_sql(self.query_one("#sql-editor").value)
+
+    @work(exclusive=True, thread=True)
+    def _execute_sql(self, query: str) -> None:
+        worker = get_current_worker()
         table = self.query_one(DataTable)
         info_bar = self.query_one("#result-info")
+        call = self.app.call_from_thread
 
         try:
             start_time = time.time()
-            result = self._db.execute_sql(query)
-            result = json.loads(result)
+            with self._db.execute_sql(query) as (description, chunks):
+                if worker.is_cancelled:
+                    return
+                call(table.clear)
+                if not table.columns:
+                    columns = [column[0] for column in description or ()]
+                    call(table.add_columns, *columns)
+                rows_fetched = 0
+                for chunk in chunks:
+                    if worker.is_cancelled:
+                        return
+                    call(self._add_result_rows, table, chunk, rows_fetched)
+                    rows_fetched += len(chunk)
+                    call(info_bar.update, f"Rows Fetched: {rows_fetched}")
             end_time = time.time()
             time_taken = f"{end_time - start_time}:.2f"
-            info_bar.update(
-                f"Rows Fetched: {len(result)} | Execution Time: {time_taken}"
+            call(
+                info_bar.update,
+                f"Rows Fetched: {rows_fetched} | Execution Time: {time_taken}",
             )
-            table.zebra_stripes = True
-            table.cursor_type = "row"
-            table.clear()
-            if not table.columns:
-                table.add_columns(*list(result[0].keys()))
-            for i, row in enumerate(result, start=1):
-                table.add_row(*tuple(row.values()), label=str(i))
-            table.focus()
+            call(table.focus)
 
         except sqlite3.OperationalError as e:
-            info_bar.update(Text(f"Error Occured: {e}", style="bold red"))
+            # An interrupted query of a cancelled run is not an error
+            if not worker.is_cancelled:
+                call(info_bar.update, Text(f"Error Occured: {e}", style="bold red"))
         except Exception as e:
             raise
 
+    def _add_result_rows(self, table: DataTable, rows, rows_fetched: int) -> None:
+        for label, row in enumerate(rows, start=rows_fetched + 1):
+            table.add_row(*row, label=str(label))
+
 
 class Ara(App):
     CSS_PATH = Path(__file__).parent / "ara.scss"
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+import re
 from typing import ClassVar, Set
 
 from rich.cells import cell_len, get_character_cell_size
 from rich.console import Console, ConsoleOptions, RenderableType, RenderResult
 from rich.highlighter import Highlighter
-from rich.syntax import Syntax
+from rich.style import StyleType
+from rich.syntax import Syntax, SyntaxPosition
 from rich.text import Text
 from textual import events
 from textual.binding import Binding, BindingType
@@ -17,6 +19,12 @@ from textual.reactive import reactive, var
 from textual.scroll_view import ScrollView
 
 
+def _is_single_cell(text: str) -> bool:
+    """Flag to indicate if every character of the text is one cell wide"""
+    # Control characters such as "\n" and "\t" are zero cells wide
+    return text.isascii() and text.isprintable()
+
+
 class _InputRenderable:
     """Render the input content"""
 
@@ -34,11 +42,61 @@ class _InputRenderable:
             cursor = input.cursor_position
             line = input.cursor_line + 1
             cursor_style = "underline"
-            result.stylize_range(cursor_style, (line, cursor - 1), (line, cursor))
+            result.stylize_cursor(cursor_style, (line, cursor - 1), (line, cursor))
 
         yield result
 
 
+class _SQLSyntax(Syntax):
+    """SQL Syntax that re-uses the lexed text of its TextArea"""
+
+    def __init__(self, input: TextArea, **kwargs) -> None:
+        super().__init__(input.value, "sql", **kwargs)
+        self.input = input
+        self.cursor: tuple[StyleType, SyntaxPosition, SyntaxPosition] | None = None
+
+    def stylize_cursor(
+        self, style: StyleType, start: SyntaxPosition, end: SyntaxPosition
+    ) -> None:
+        """Style the cursor, with positions as in Syntax.stylize_range"""
+        # Unlike stylize_range this is applied after the cached lexing
+        self.cursor = (style, start, end)
+
+    def highlight(
+        self,
+        code: str,
+        line_range: tuple[int | None, int | None] | None = None,
+    ) -> Text:
+        key = (code, line_range)
+        cached = self.input._highlighted
+        if cached is None or cached[0] != key:
+            text = super().highlight(code, line_range)
+            line_starts = [
+                0,
+                *[match.end() for match in re.finditer("\n", text.plain)],
+                len(text.plain) + 1,
+            ]
+            cached = (key, text, line_starts)
+            self.input._highlighted = cached
+        _, text, line_starts = cached
+        text = text.copy()
+        if self.cursor is not None:
+            style, start, end = self.cursor
+            start_index = self._code_index(line_starts, start)
+            end_index = self._code_index(line_starts, end)
+            if start_index is not None and end_index is not None:
+                text.stylize(style, start_index, end_index)
+        return text
+
+    @staticmethod
+    def _code_index(line_starts: list[int], position: SyntaxPosition) -> int | None:
+        line_number, column = position
+        if line_number >= len(line_starts):
+            return None
+        line_length = line_starts[line_number] - line_starts[line_number - 1] - 1
+        return line_starts[line_number - 1] + min(line_length, column)
+
+
 class TextArea(ScrollView, can_focus=True):
     """A TextArea widget"""
 
@@ -90,6 +148,10 @@ class TextArea(ScrollView, can_focus=True):
     _cursor_visible = reactive(True)
     max_size: reactive[int | None] = reactive(None)
     cursor_offset = var(Offset(0, 0))
+    _lines: list[str]
+    _lines_value: str | None = None
+    _longest_line: int = 0
+    _highlighted: tuple[tuple, Text, list[int]] | None = None
 
     class Changed(Message, bubble=True):
         def __init__(self, input: TextArea, value: str) -> None:
@@ -118,6 +180,47 @@ class TextArea(ScrollView, can_focus=True):
         self.highlighter = highlighter
         self.chat_container: ScrollableContainer | None = None
 
+    def _sync_lines(self) -> None:
+        """Re-split the value if it was replaced outside the edit paths
+
+        The edit paths record the exact str they assign to value in
+        _lines_value, so this relies on the value reactive storing and
+        returning that same object. An equal but distinct str only costs a
+        re-split.
+        """
+        if self._lines_value is not self.value:
+            self._lines = self.value.split("\n")
+            self._lines_value = self.value
+            self._longest_line = max(map(len, self._lines))
+
+    @property
+    def _document_lines(self) -> list[str]:
+        """The value split into lines"""
+        self._sync_lines()
+        return self._lines
+
+    @property
+    def _max_line_length(self) -> int:
+        """Length of the longest line"""
+        self._sync_lines()
+        return self._longest_line
+
+    def _replace_lines(self, start: int, end: int, new_lines: list[str]) -> None:
+        lines = self._document_lines
+        removed_length = max(map(len, lines[start:end]))
+        lines[start:end] = new_lines
+        new_length = max(map(len, new_lines))
+        if new_length >= self._longest_line:
+            self._longest_line = new_length
+        elif removed_length == self._longest_line:
+            self._longest_line = max(map(len, lines))
+
+    def _line_and_column(self, position: int) -> tuple[int, int]:
+        value = self.value
+        line = value.count("\n", 0, position)
+        column = position - value.rfind("\n", 0, position) - 1
+        return line, column
+
     def _position_to_cell(self, position: int) -> int:
         cell_offset = cell_len(self.value[:position])
         return cell_offset
@@ -135,17 +238,16 @@ class TextArea(ScrollView, can_focus=True):
         return self.cursor_position >= len(self.value)
 
     def validate_cursor_position(self, cursor_position: int) -> int:
-        return min(max(0, cursor_position), max(list(map(len, self.value.split("\n")))))
+        return min(max(0, cursor_position), self._max_line_length)
 
     def validate_cursor_line(self, cursor_line: int) -> int:
-        return min(max(0, cursor_line), self.value.count("\n") + 2)
+        return min(max(0, cursor_line), len(self._document_lines) + 1)
 
     async def watch_value(self, value: str) -> None:
-        self.cursor_line = self.value.count("\n")
+        lines = self._document_lines
+        self.cursor_line = len(lines) - 1
         self.refresh(layout=True)
-        self.virtual_size = Size(
-            max(list(map(len, self.value.split("\n")))), self.cursor_line + 1
-        )
+        self.virtual_size = Size(self._max_line_length, len(lines))
         self.scroll_end(animate=False)
         self.post_message(self.Changed(self, value))
 
@@ -156,7 +258,6 @@ class TextArea(ScrollView, can_focus=True):
         return self._position_to_cell(len(self.value)) + 1
 
     def render(self) -> RenderableType:
-        self.view_position = self.view_position
         if not self.value:
             placeholder = Text(self.placeholder, justify="left")
             placeholder.stylize(self.get_component_rich_style("textarea--placeholder"))
@@ -173,8 +274,8 @@ class TextArea(ScrollView, can_focus=True):
     @property
     def _value(self) -> Syntax:
         cursor_line = self.cursor_line
-        syntax = Syntax(
-            self.value, "sql", line_numbers=True, highlight_lines=set([cursor_line + 1])
+        syntax = _SQLSyntax(
+            self, line_numbers=True, highlight_lines=set([cursor_line + 1])
         )
         return syntax
 
@@ -220,27 +321,31 @@ class TextArea(ScrollView, can_focus=True):
         if offset is None:
             return
         event.stop()
-        click_x = offset.x + self.view_position
-        cell_offset = 0
+        self.cursor_position = self._cell_to_position(offset.x + self.view_position)
+
+    def _cell_to_position(self, cell_offset: int) -> int:
+        value = self.value
+        if _is_single_cell(value[:cell_offset]):
+            return min(cell_offset, len(value))
+        offset = 0
         _cell_size = get_character_cell_size
-        for index, char in enumerate(self.value):
-            if cell_offset >= click_x:
-                self.cursor_position = index
-                break
-            cell_offset += _cell_size(char)
-        else:
-            self.cursor_position = len(self.value)
+        for index, char in enumerate(value):
+            if offset >= cell_offset:
+                return index
+            offset += _cell_size(char)
+        return len(value)
 
     def insert_text_at_cursor(self, text: str) -> None:
-        if self.cursor_position > len(self.value):
-            self.value += text
-            self.cursor_position = len(self.value)
-        else:
-            value = self.value
-            before = value[: self.cursor_position]
-            after = value[self.cursor_position :]
-            self.value = f"{before}{text}{after}"
-            self.cursor_position += len(text)
+        value = self.value
+        position = min(self.cursor_position, len(value))
+        row, column = self._line_and_column(position)
+        line = self._document_lines[row]
+        self._replace_lines(
+            row, row + 1, f"{line[:column]}{text}{line[column:]}".split("\n")
+        )
+        self._lines_value = f"{value[:position]}{text}{value[position:]}"
+        self.value = self._lines_value
+        self.cursor_position = position + len(text)
 
     def action_cursor_left(self) -> None:
         self.cursor_position -= 1
@@ -262,15 +367,17 @@ class TextArea(ScrollView, can_focus=True):
         self.insert_text_at_cursor("\n")
 
     def action_delete_left(self) -> None:
-        if self.cursor_position <= 0:
+        value = self.value
+        delete_position = min(self.cursor_position, len(value)) - 1
+        if delete_position < 0:
             return
-        if self.cursor_position == len(self.value):
-            self.value = self.value[:-1]
-            self.cursor_position = len(self.value)
+        lines = self._document_lines
+        row, column = self._line_and_column(delete_position)
+        if value[delete_position] == "\n":
+            self._replace_lines(row, row + 2, [lines[row] + lines[row + 1]])
         else:
-            value = self.value
-            delete_position = self.cursor_position - 1
-            before = value[:delete_position]
-            after = value[delete_position + 1 :]
-            self.value = f"{before}{after}"
-            self.cursor_position = delete_position
+            line = lines[row]
+            self._replace_lines(row, row + 1, [f"{line[:column]}{line[column + 1:]}"])
+        self._lines_value = f"{value[:delete_position]}{value[delete_position + 1:]}"
+        self.value = self._lines_value
+        self.cursor_position = delete_position
@@ -0,0 +1,154 @@
+import asyncio
+
+import pytest
+from rich.cells import get_character_cell_size
+from rich.console import Console
+from rich.syntax import Syntax
+from textual import events
+from textual.app import App, ComposeResult
+
+from src.widget import textarea as textarea_module
+from src.widget.textarea import TextArea
+
+
+class TextAreaApp(App):
+    def __init__(self, value: str) -> None:
+        super().__init__()
+        self.value = value
+
+    def compose(self) -> ComposeResult:
+        yield TextArea(value=self.value)
+
+
+def run_with_textarea(value, test) -> None:
+    """Run test against a TextArea mounted in an app"""
+
+    async def run() -> None:
+        app = TextAreaApp(value)
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            await test(app.query_one(TextArea), pilot)
+
+    asyncio.run(run())
+
+
+def scan_cell_to_position(value: str, click_x: int) -> int:
+    """The original per-character scan from TextArea._on_click"""
+    cell_offset = 0
+    for index, char in enumerate(value):
+        if cell_offset >= click_x:
+            return index
+        cell_offset += get_character_cell_size(char)
+    return len(value)
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "select 1",
+        "a\nbbbbbbbbbbbbbbbbbbbb",
+        "select *\n\tfrom t\nwhere a = 1",
+        "select '日本語'\nfrom t",
+    ],
+)
+def test_cell_to_position_matches_scan(value: str) -> None:
+    async def test(textarea: TextArea, pilot) -> None:
+        for click_x in range(len(value) * 2 + 2):
+            assert textarea._cell_to_position(click_x) == scan_cell_to_position(
+                value, click_x
+            )
+
+    run_with_textarea(value, test)
+
+
+
+@pytest.mark.parametrize("click_x", [0, 40, 60, 200])
+def test_cell_to_position_cost_is_bounded_by_click(monkeypatch, click_x: int) -> None:
+    value = "select '日本語', b from some_table where a = 1\n" * 250
+    calls = 0
+
+    def cell_size(char: str) -> int:
+        nonlocal calls
+        calls += 1
+        return get_character_cell_size(char)
+
+    monkeypatch.setattr(textarea_module, "get_character_cell_size", cell_size)
+
+    async def test(textarea: TextArea, pilot) -> None:
+        assert len(value) > 10_000
+        assert textarea._cell_to_position(click_x) == scan_cell_to_position(
+            value, click_x
+        )
+        assert calls <= click_x + 1
+
+    run_with_textarea(value, test)
+
+def test_insert_updates_lines() -> None:
+    async def test(textarea: TextArea, pilot) -> None:
+        textarea.cursor_position = 6
+        textarea.insert_text_at_cursor(" *")
+        assert textarea.value == "select * 1\nfrom t"
+        assert textarea._document_lines == ["select * 1", "from t"]
+        assert textarea._max_line_length == 10
+
+    run_with_textarea("select 1\nfrom t", test)
+
+
+def test_delete_at_newline_joins_lines() -> None:
+    async def test(textarea: TextArea, pilot) -> None:
+        textarea.cursor_position = 9
+        textarea.action_delete_left()
+        assert textarea.value == "select 1from table"
+        assert textarea._document_lines == ["select 1from table"]
+        assert textarea._max_line_length == 18
+
+    run_with_textarea("select 1\nfrom table", test)
+
+
+def test_multi_line_paste_splits_lines() -> None:
+    async def test(textarea: TextArea, pilot) -> None:
+        textarea.cursor_position = 2
+        textarea._on_paste(events.Paste("lect *\r\nfrom t\nwhere 1 = 1\nse"))
+        assert textarea.value == "select *\nfrom t\nwhere 1 = 1\nselect 1"
+        assert textarea._document_lines == textarea.value.split("\n")
+        assert textarea._max_line_length == 11
+
+    run_with_textarea("select 1", test)
+
+
+def render(renderable) -> str:
+    console = Console(width=60, force_terminal=True, color_system="truecolor")
+    with console.capture() as capture:
+        console.print(renderable)
+    return capture.get()
+
+
+def test_cached_highlight_matches_fresh_lex() -> None:
+    value = "select a, b\nfrom t\nwhere a = 1"
+
+    def fresh_syntax(line: int, cursor: int) -> Syntax:
+        syntax = Syntax(value, "sql", line_numbers=True, highlight_lines={line})
+        syntax.stylize_range("underline", (line, cursor - 1), (line, cursor))
+        return syntax
+
+    async def test(textarea: TextArea, pilot) -> None:
+        for line, cursor in [(1, 3), (2, 4), (3, 0), (3, 20)]:
+            textarea.cursor_line = line - 1
+            syntax = textarea._value
+            syntax.stylize_cursor("underline", (line, cursor - 1), (line, cursor))
+            assert render(syntax) == render(fresh_syntax(line, cursor))
+            if line == 1:
+                lexed = textarea._highlighted
+            assert textarea._highlighted is lexed
+
+    run_with_textarea(value, test)
+
+
+def test_splitting_longest_line_shrinks_max_line_length() -> None:
+    async def test(textarea: TextArea, pilot) -> None:
+        textarea.cursor_position = 7
+        textarea.insert_text_at_cursor("\n")
+        assert textarea._document_lines == ["select ", "a, b, c", "from t"]
+        assert textarea._max_line_length == 7
+
+    run_with_textarea("select a, b, c\nfrom t", test)
@@ -0,0 +1,115 @@
+import asyncio
+import sqlite3
+import time
+from pathlib import Path
+
+import pytest
+from textual.widgets import DataTable
+
+from src import tsql
+
+ROWS = tsql.SQLDB.FETCH_SIZE * 2 + 500
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    path = tmp_path / "test.db"
+    conn = sqlite3.connect(path)
+    conn.execute("create table t(a, b)")
+    conn.executemany("insert into t values (?, ?)", ((i, str(i)) for i in range(ROWS)))
+    conn.commit()
+    conn.close()
+    monkeypatch.setattr(tsql, "PATH", str(path))
+    tsql._get_database.cache_clear()
+    yield path
+    tsql._get_database.cache_clear()
+
+
+def test_get_database_shares_one_connection_per_file(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    tsql._get_database.cache_clear()
+    try:
+        db = tsql.get_database("test.db")
+        assert tsql.get_database("./test.db") is db
+        assert tsql.get_database(Path("test.db")) is db
+        assert tsql.get_database(str(tmp_path / "test.db")) is db
+        assert tsql.get_database(":memory:") is tsql.get_database(":memory:")
+    finally:
+        tsql._get_database.cache_clear()
+
+
+def run_with_screen(test) -> None:
+    """Run test against the EditorScreen of a running app"""
+
+    async def run() -> None:
+        app = tsql.Ara()
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            await test(app.screen, pilot)
+
+    asyncio.run(run())
+
+
+async def execute(screen, pilot, query: str, presses: int = 1) -> None:
+    screen.query_one("#sql-editor").value = query
+    for _ in range(presses):
+        await pilot.press("ctrl+e")
+    await screen.app.workers.wait_for_complete()
+    await pilot.pause()
+
+
+def info_text(screen) -> str:
+    return str(screen.query_one("#result-info").render())
+
+
+def test_large_result_has_continuous_labels(database) -> None:
+    async def test(screen, pilot) -> None:
+        await execute(screen, pilot, "select * from t")
+        table = screen.query_one(DataTable)
+        assert table.row_count == ROWS
+        labels = [str(row.label) for row in table.rows.values()]
+        assert labels == [str(i) for i in range(1, ROWS + 1)]
+        assert table.get_row_at(ROWS - 1) == [ROWS - 1, str(ROWS - 1)]
+        assert info_text(screen).startswith(f"Rows Fetched: {ROWS} |")
+
+    run_with_screen(test)
+
+
+def test_repeated_execute_leaves_one_result_set(database) -> None:
+    async def test(screen, pilot) -> None:
+        await execute(screen, pilot, "select * from t", presses=2)
+        assert screen.query_one(DataTable).row_count == ROWS
+
+    run_with_screen(test)
+
+
+def test_non_select_statement(database) -> None:
+    async def test(screen, pilot) -> None:
+        await execute(screen, pilot, "create table u(x)")
+        assert screen.query_one(DataTable).row_count == 0
+        assert info_text(screen).startswith("Rows Fetched: 0 |")
+
+    run_with_screen(test)
+    conn = sqlite3.connect(database)
+    assert conn.execute("select name from sqlite_master where name = 'u'").fetchone()
+    conn.close()
+
+
+SLOW_QUERY = """
+with recursive c(x) as (select 1 union all select x + 1 from c where x < 100000000)
+select count(*) from c
+"""
+
+
+def test_execute_interrupts_running_query(database) -> None:
+    async def test(screen, pilot) -> None:
+        screen.query_one("#sql-editor").value = SLOW_QUERY
+        await pilot.press("ctrl+e")
+        await asyncio.sleep(0.2)
+        start_time = time.monotonic()
+        await execute(screen, pilot, "select * from t")
+        assert time.monotonic() - start_time < 5
+        assert screen.query_one(DataTable).row_count == ROWS
+        assert info_text(screen).startswith(f"Rows Fetched: {ROWS} |")
+
+    run_with_screen(test)